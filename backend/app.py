@@ -5,21 +5,13 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from routes.api import api
 from utils.logger import get_logger
+from utils.http_cache import compress_response
 import os
 
 # Logger
 logger = get_logger()
 
-# Initialize app
-app = Flask(__name__)
-CORS(app)
-
-# Register blueprints
-app.register_blueprint(api, url_prefix='/api')
-
-@app.route('/')
 def index():
     try:
         logger.info("Health check route '/' called.")
@@ -32,8 +24,59 @@ def index():
     except Exception as e:
             logger.error(f"Error running application: {str(e)}")
             return jsonify({"message": "Error running API"}), 500
-    
+
+def warm_up() -> None:
+    """
+    Imports the service modules, constructs their OpenAI clients and loads the
+    tokenizer ahead of the first request.
+
+    Intended for pre-fork servers (e.g. `gunicorn --preload`), so the imports are
+    done once in the master process and shared by every worker.
+    """
+    from services import verify_service, research_service, prompt_templates
+    verify_service.get_client()
+    research_service.get_client()
+    prompt_templates.load_encoder()
+    logger.info("Services warmed up")
+
+def create_app(preload: bool = False) -> Flask:
+    """
+    Creates and configures the Flask application.
+
+    The openai package and its clients are not imported here; each service imports and
+    constructs its client on the first request that needs it unless `preload` is set.
+
+    Args:
+        preload (bool, optional): Warm up services before returning. Defaults to False.
+
+    Returns:
+        Flask: The configured application.
+    """
+    app = Flask(__name__)
+    CORS(app)
+
+    # Register blueprints
+    from routes.api import api
+    app.register_blueprint(api, url_prefix='/api')
+    app.add_url_rule('/', view_func=index)
+
+    # Compress large responses negotiated on Accept-Encoding
+    app.after_request(compress_response)
+
+    # Warm the result store for watchlist entities during off-peak windows
+    if os.getenv("PREFETCH_ENABLED", "false").lower() == "true":
+        from services.watchlist_service import start_scheduler
+        start_scheduler()
+
+    if preload:
+        warm_up()
+
+    return app
+
+# Initialize app
+app = create_app(preload=os.getenv("PRELOAD_SERVICES", "false").lower() == "true")
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     logger.info(f"Starting backend server at port {port}")
-    app.run(host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=port, debug=True)
@@ -0,0 +1,211 @@
+"""
+Prompt token benchmark for /api/verify and /api/research.
+
+Compares the prompts sent before the prompt templates were introduced (copied
+verbatim below) with the current precompiled templates, for a sample entity:
+    - total: system + user prompt tokens per request
+    - prefix: tokens in the static system message, identical across requests
+    - dynamic: tokens that change per entity
+    - cacheable: whether the static prefix alone reaches the upstream's
+      1024-token minimum for prompt-prefix caching
+
+Token counts use tiktoken when its encoding can be loaded (set TIKTOKEN_CACHE_DIR
+on hosts without internet access), otherwise the same length-based estimate the
+app falls back to.
+
+Usage:
+    python benchmarks/prompt_benchmark.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import prompt_templates
+from services.prompt_templates import count_tokens, get_system_prompt, render_user_prompt
+
+# Minimum prompt length the upstream caches, in tokens
+CACHE_MIN_TOKENS = 1024
+
+SAMPLE = {"name": "Jane Doe", "title": "Associate Professor", "affiliation": "Stanford University"}
+
+# Prompts as sent before the prompt templates were introduced
+
+def legacy_verify_system_prompt(entity_type):
+    """
+    Returns the appropriate system prompt based on entity type
+
+    Args:
+        entity_type: Either 'academic' or 'startup'
+
+    Returns:
+        The system prompt as a string
+    """
+    prompts = {
+        "academic": (
+            "You are a research assistant that identifies academic professionals based on their name and affiliation.\n\n"
+            "Your task is to return structured, accurate, and current information about the academic's identity.\n\n"
+            "Focus on:\n"
+            "- Full name\n"
+            "- Current affiliation\n"
+            "- Current position/title\n"
+            "- A short professional description (including research interests)\n"
+            "- Confidence in the match\n\n"
+            "Guidelines:\n"
+            "- If multiple matches exist, return the most relevant one based on recency and academic profile completeness.\n"
+            "- If no exact match is found, return the closest relevant match with a reduced confidence score.\n"
+            "- If no match is found at all, return an empty object with \"confidence_score\": 0.\n\n"
+            "Confidence Score Guide:\n"
+            "- 100 = Exact match (name + affiliation + title verified)\n"
+            "- 80-99 = High match (1 fuzzy detail, like abbreviated name or outdated title)\n"
+            "- 50-79 = Partial match (multiple fields fuzzy or inferred)\n"
+            "- 0 = No match found"
+        ),
+        "startup": (
+            "You are a research assistant that identifies startup founders and their companies based on provided names or organization details.\n\n"
+            "Your task is to return structured, accurate, and current information about the founder and their startup.\n\n"
+            "Focus on:\n"
+            "- Full name of the founder\n"
+            "- Role in the startup\n"
+            "- Startup name and description (what it does)\n"
+            "- Current funding stage and any notable achievements (e.g., awards, acquisitions, press)\n"
+            "- Confidence in the match\n\n"
+            "Guidelines:\n"
+            "- If multiple matches exist, return the most relevant one based on recency and profile completeness.\n"
+            "- If no exact match is found, return the closest relevant match with a reduced confidence score.\n"
+            "- If no match is found at all, return an empty object with \"confidence_score\": 0.\n\n"
+            "Confidence Score Guide:\n"
+            "- 100 = Exact match (founder + startup + role + stage verified)\n"
+            "- 80-99 = High match (1 fuzzy detail, like outdated role or partial name)\n"
+            "- 50-79 = Partial match (multiple fields fuzzy or inferred)\n"
+            "- 0 = No match found"
+        )
+    }
+    return prompts.get(entity_type, prompts["academic"])
+
+def legacy_verify_user_prompt(name, affiliation):
+    # Inlined in verify_entity before the prompt templates were introduced
+    user_prompt = f"""Find information about {name} from {affiliation}.
+        
+        Return a valid JSON object with EXACTLY the following fields:
+        {{
+            "full_name": "Complete name of the person or empty string if not found",
+            "affiliation": "Current institution or company, or empty string if not found",
+            "title": "Current position or role, or empty string if not found",
+            "brief_description": "1–2 sentence summary including research area and academic focus",
+            "confidence_score": "A number from 0–100 indicating match confidence"
+        }}
+        
+        Return only the JSON object. Do not include any additional explanations or commentary.
+        """
+    return user_prompt
+
+def legacy_research_system_prompt(entity_type):
+    """
+    Returns the appropriate system prompt based on entity type
+
+    Args:
+        entity_type: Either 'academic' or 'startup'
+
+    Returns:
+        The system prompt as a string
+    """
+    prompts = {
+    "academic": """You are a research assistant tasked with generating structured, detailed research profiles for academic professionals.
+    
+    Your objective is to gather factual, well-sourced, and relevant data that would support academic grant writing and collaboration strategy.
+    
+    Focus Areas:
+    1. Current and past research focus areas
+    2. Notable publications and projects
+    3. Academic or industry collaborations and affiliations
+    4. Previous grants or research funding
+    5. Public mentions or recognition (e.g., news, awards)
+    6. Strategic insights to support grant planning
+    
+    Guidelines:
+    - Use only verifiable data from credible sources (e.g., university websites, Google Scholar, Scopus, ORCID, funding agency databases).
+    - Do not guess or fabricate insights. If a section has fewer than 3 items, include only what is known.
+    - Include exactly the fields defined in the JSON schema. Return an empty array for any category where data could not be verified.
+    """,
+    
+    "startup": """You are a research assistant tasked with generating structured, detailed profiles for startup founders and their companies.
+    
+    Your objective is to gather factual, well-sourced, and relevant data that would support funding strategy and strategic alignment.
+    Focus Areas:
+    1. Business focus areas and market positioning
+    2. Products, services, and technological innovations
+    3. Strategic partnerships and industry collaborations
+    4. Previous funding rounds, grants, and investors
+    5. Public mentions or recognition (e.g., press coverage, awards, accelerators)
+    6. Strategic insights to support investment pitches or partnership outreach
+    Guidelines:
+    - Use only verifiable data from credible sources (e.g., Crunchbase, company websites, press releases, LinkedIn, funding databases).
+    - Do not guess or fabricate insights. If a section has fewer than 3 items, include only what is known.
+    - Include exactly the fields defined in the JSON schema. Return an empty array for any category where data could not be verified.
+    """
+    }
+    return prompts.get(entity_type, prompts["academic"])
+
+def legacy_research_user_prompt(name, title, affiliation):
+    user_prompt = f"""Provide detailed research on {name}, {title} at {affiliation}.
+
+    All data must be specifically linked to this person. Do not include information about the general research at {affiliation} unless it is explicitly tied to {name}'s work.
+    
+    Return a valid JSON object with EXACTLY the following structure:
+    {{
+        "research_focus": [
+            "Focus area 1",
+            "Focus area 2"
+        ],
+        "projects_publications": [
+            "Project or publication 1",
+            "Project or publication 2"
+        ],
+        "institutional_connections": [
+            "Collaborator or institution 1",
+            "Collaborator or institution 2"
+        ],
+        "funding_history": [
+            "Funding agency, project name, year (if known)"
+        ],
+        "public_mentions": [
+            "Mention or recognition 1"
+        ],
+        "strategic_insights": [
+            "Insight derived from verified information to support grants or partnerships"
+        ]
+    }}
+    - Include 3–7 items per field if available. Return fewer if needed, but do not generate unverifiable data.
+    - All information must be accurate, specific, and relevant.
+    - Return only the JSON object. Do not include any extra explanations.
+    """
+    return user_prompt
+
+def legacy_prompts(operation, entity_type):
+    if operation == "verify":
+        return (legacy_verify_system_prompt(entity_type),
+                legacy_verify_user_prompt(SAMPLE["name"], SAMPLE["affiliation"]))
+    return (legacy_research_system_prompt(entity_type),
+            legacy_research_user_prompt(SAMPLE["name"], SAMPLE["title"], SAMPLE["affiliation"]))
+
+def current_prompts(operation, entity_type):
+    values = SAMPLE if operation == "research" else {"name": SAMPLE["name"], "affiliation": SAMPLE["affiliation"]}
+    return get_system_prompt(operation, entity_type), render_user_prompt(operation, **values)
+
+def main():
+    exact = prompt_templates.load_encoder()
+    print(f"token counts: {'tiktoken ' + prompt_templates.TOKENIZER_ENCODING if exact else 'estimated (~4 chars/token)'}")
+    print(f"{'request':<20}{'before':>8}{'after':>8}{'saved':>8}{'prefix':>8}{'dynamic':>9}  cacheable")
+    for operation in ["verify", "research"]:
+        for entity_type in ["academic", "startup"]:
+            before = sum(count_tokens(p) for p in legacy_prompts(operation, entity_type))
+            system_prompt, user_prompt = current_prompts(operation, entity_type)
+            prefix, dynamic = count_tokens(system_prompt), count_tokens(user_prompt)
+            after = prefix + dynamic
+            saved = (before - after) / before * 100
+            cacheable = "yes" if prefix >= CACHE_MIN_TOKENS else f"no (<{CACHE_MIN_TOKENS})"
+            print(f"{operation + '/' + entity_type:<20}{before:>8}{after:>8}{saved:>7.1f}%{prefix:>8}{dynamic:>9}  {cacheable}")
+
+if __name__ == "__main__":
+    main()
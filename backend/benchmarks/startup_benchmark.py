@@ -0,0 +1,90 @@
+"""
+Startup benchmark for the backend.
+
+Each run starts a fresh interpreter and measures:
+    - import_ms: time to import `app` (which builds the application)
+    - first_request_ms: time to serve the first request to '/'
+    - first_verify_ms: time to serve the first POST /api/verify, covering the route,
+      the result store, prompt rendering and the OpenAI client setup. The model call
+      itself is stubbed out with a canned answer, so no network access is needed.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 10] [--preload]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside a fresh interpreter and prints timings as JSON
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get('/')
+served = time.perf_counter()
+assert response.status_code == 200, response.status_code
+
+from services import verify_service
+def call_openai_api(system_prompt, user_prompt, entity_type="academic"):
+    verify_service.get_client()
+    return json.dumps({"full_name": "Ada Lovelace", "affiliation": "University of London",
+                       "title": "Mathematician", "brief_description": "Benchmark entity.",
+                       "confidence_score": 95})
+verify_service.call_openai_api = call_openai_api
+
+started = time.perf_counter()
+response = app.app.test_client().post('/api/verify', json={"name": "Ada Lovelace", "affiliation": "University of London"})
+verified = time.perf_counter()
+assert response.status_code == 200, response.status_code
+assert response.get_json()["data"]["verification_status"] == "success", response.get_json()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (served - imported) * 1000,
+    "first_verify_ms": (verified - started) * 1000,
+}))
+"""
+
+def run_once(preload: bool, workdir: str) -> dict:
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark"),
+        "PRELOAD_SERVICES": "true" if preload else "false",
+        "PREFETCH_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=workdir, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters to start")
+    parser.add_argument("--preload", action="store_true", help="set PRELOAD_SERVICES=true")
+    args = parser.parse_args()
+
+    # Each run gets an empty scratch directory, so its verify request misses the result
+    # store and log and store files do not land in the repo
+    def run_fresh() -> dict:
+        with tempfile.TemporaryDirectory() as workdir:
+            return run_once(args.preload, workdir)
+
+    run_fresh()  # warm the filesystem and bytecode caches
+    results = [run_fresh() for _ in range(args.runs)]
+
+    print(f"{'metric':<18}{'median':>10}{'min':>10}{'max':>10}  (ms, {args.runs} runs, preload={args.preload})")
+    for metric in ["import_ms", "first_request_ms", "first_verify_ms"]:
+        values = [r[metric] for r in results]
+        print(f"{metric:<18}{statistics.median(values):>10.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
-from datetime import datetime
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime, timezone
+from flask import Blueprint, Response, request, jsonify
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from services.verify_service import verify_entity
 from services.research_service import generate_research
+from services.result_store import (
+    get_result, get_entry, save_result, make_result_id, content_hash, is_complete_result
+)
+from services.prompt_templates import get_usage_stats
+from services.watchlist_service import (
+    load_watchlist, add_entries, remove_entry, get_prefetch_stats, start_prefetch, get_running_pass
+)
 from utils.logger import get_logger
+from utils.http_cache import cached_body_for_request, is_not_modified
 
 api = Blueprint('api', __name__)
 
@@ -17,7 +26,7 @@ limiter = Limiter(
     default_limits=["200 per day", "50 per hour"]
 )
 
-def create_response(success, data=None, error=None, status_code=200):
+def create_response(success, data=None, error=None, status_code=200, result_id=None, etag=None):
     """
     Creates a standardized JSON response for API endpoints.
 
@@ -26,6 +35,8 @@ def create_response(success, data=None, error=None, status_code=200):
         data (dict or list, optional): The data payload to include in the response. Defaults to None.
         error (str or dict, optional): Error message or details if the operation failed. Defaults to None.
         status_code (int, optional): HTTP status code to return. Defaults to 200.
+        result_id (str, optional): Id under which the result can be fetched again. Defaults to None.
+        etag (str, optional): Content hash of `data`, sent as a weak ETag. Defaults to None.
 
     Returns:
         tuple: A Flask Response object containing a JSON payload and the HTTP status code.
@@ -40,8 +51,55 @@ def create_response(success, data=None, error=None, status_code=200):
     
     if error is not None:
         response["error"] = error
-        
-    return jsonify(response), status_code
+
+    if result_id is not None:
+        response["result_id"] = result_id
+
+    response = jsonify(response)
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    return response, status_code
+
+def create_stored_response(kind, result_id):
+    """
+    Creates a conditional response for a stored result.
+
+    The body is stable for a stored entry (its timestamp is the time the result was
+    stored), so it is serialized and compressed once and reused for repeat requests.
+    Clients presenting a matching If-None-Match get a 304 without a body.
+
+    Args:
+        kind (str): Either 'verify' or 'research'.
+        result_id (str): The id of the stored result.
+
+    Returns:
+        Flask Response: 200 with the stored result, 304 if unchanged, or 404 if not found.
+    """
+    entry = get_entry(kind, result_id)
+    if entry is None:
+        return create_response(False, None, "Result not found or expired", 404)
+
+    etag = entry["content_hash"]
+    if is_not_modified(etag):
+        response = Response(status=304)
+    else:
+        def serialize():
+            return json.dumps({
+                "success": True,
+                "timestamp": datetime.fromtimestamp(entry["stored_at"], timezone.utc).replace(tzinfo=None).isoformat(),
+                "data": entry["result"],
+                "result_id": result_id
+            }).encode("utf-8")
+
+        body, encoding = cached_body_for_request(f"{result_id}:{etag}:{entry['stored_at']}", serialize)
+        response = Response(body, status=200, mimetype="application/json")
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
 
 @api.route('/verify', methods=['POST'])
 @limiter.limit("10 per minute")
@@ -86,6 +144,13 @@ def verify():
             logger.warning(f"Invalid entity_type: {entity_type}, defaulting to 'academic'")
             entity_type = "academic"
         
+        result_id = make_result_id("verify", entity_type, name, affiliation)
+
+        # Serve warm results stored by the watchlist prefetcher or earlier requests
+        stored = get_result("verify", entity_type, name, affiliation)
+        if stored is not None:
+            return create_response(True, stored, None, 200, result_id, content_hash(stored))
+
         # Process verification request
         result = verify_entity(
             name = name,
@@ -98,8 +163,13 @@ def verify():
             if "error" in result and any(msg in result["error"].lower() for msg in ["invalid name", "invalid affiliation"]):
                 return create_response(False, None, result, 400)
             return create_response(False, None, result, 422)
-        
-        return create_response(True, result, None, 200)
+
+        # Only complete results are stored and get a result id
+        if not is_complete_result("verify", result):
+            return create_response(True, result, None, 200)
+
+        save_result("verify", entity_type, name, affiliation, result)
+        return create_response(True, result, None, 200, result_id, content_hash(result))
 
     except Exception as e:
         logger.error(f"Error running verification: {str(e)}")
@@ -118,7 +188,7 @@ def research():
     Returns:
         Flask Response:
             - 200 OK with generated research data.
-            - 400 Bad Request if required data is missing.
+            - 400 Bad Request if required data is missing or entityInfo is not an object.
             - 500 Internal Server Error for unexpected issues.
     """
     try:
@@ -134,14 +204,218 @@ def research():
             logger.error(f"Error fetching entity info from request")
             return create_response(False, None, "Entity information is required", 400)
         
+        entity_info = data.get('entityInfo', {})
+        entity_type = data.get('entityType', 'academic')
+
+        if not isinstance(entity_info, dict):
+            logger.error("Entity info must be a JSON object")
+            return create_response(False, None, "Entity information must be an object", 400)
+
+        if entity_type not in ["academic", "startup"]:
+            logger.warning(f"Invalid entity_type: {entity_type}, defaulting to 'academic'")
+            entity_type = "academic"
+
+        full_name = entity_info.get('full_name')
+        affiliation = entity_info.get('affiliation')
+        title = entity_info.get('title', '')
+        title = title if isinstance(title, str) else ''
+
+        # Only entities with a name and affiliation have a stable key in the result store
+        storable = all(isinstance(v, str) and v.strip() for v in (full_name, affiliation))
+        if storable:
+            result_id = make_result_id("research", entity_type, full_name, affiliation, title)
+
+            # Serve warm results stored by the watchlist prefetcher or earlier requests
+            stored = get_result("research", entity_type, full_name, affiliation, title)
+            if stored is not None:
+                return create_response(True, stored, None, 200, result_id, content_hash(stored))
+
         # Process the research request
         result = generate_research(
-            entity_info = data.get('entityInfo', {}),
-            entity_type = data.get('entityType', 'academic')
+            entity_info = entity_info,
+            entity_type = entity_type
         )
 
-        return create_response(True, result, None, 200)
+        # Fallback or failed research, and research for unkeyed entities, is returned as before but not stored
+        if not storable or not is_complete_result("research", result):
+            return create_response(True, result, None, 200)
+
+        save_result("research", entity_type, full_name, affiliation, result, title=title)
+        return create_response(True, result, None, 200, result_id, content_hash(result))
     
     except Exception as e:
         logger.error(f"Error running research: {str(e)}")
-        return create_response(False, None, "An unexpected error occurred", 500)
\ No newline at end of file
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/verify/<result_id>', methods=['GET'])
+def get_verification(result_id):
+    """
+    GET endpoint returning a stored verification result.
+
+    Honours If-None-Match against the result's weak ETag.
+
+    Args:
+        result_id (str): The result_id returned by POST /verify.
+
+    Returns:
+        Flask Response:
+            - 200 OK with the stored verification result.
+            - 304 Not Modified if the client's copy is current.
+            - 404 Not Found if there is no fresh stored result.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        return create_stored_response("verify", result_id)
+    except Exception as e:
+        logger.error(f"Error fetching stored verification: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/research/<result_id>', methods=['GET'])
+def get_research(result_id):
+    """
+    GET endpoint returning a stored research profile.
+
+    Honours If-None-Match against the result's weak ETag.
+
+    Args:
+        result_id (str): The result_id returned by POST /research.
+
+    Returns:
+        Flask Response:
+            - 200 OK with the stored research profile.
+            - 304 Not Modified if the client's copy is current.
+            - 404 Not Found if there is no fresh stored result.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        return create_stored_response("research", result_id)
+    except Exception as e:
+        logger.error(f"Error fetching stored research: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/prompt-stats', methods=['GET'])
+def prompt_stats():
+    """
+    GET endpoint reporting local prompt token counts and upstream cached tokens per operation.
+
+    Returns:
+        Flask Response:
+            - 200 OK with usage totals keyed by operation and entity type.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        return create_response(True, get_usage_stats(), None, 200)
+    except Exception as e:
+        logger.error(f"Error computing prompt stats: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/watchlist', methods=['GET'])
+def get_watchlist():
+    """
+    GET endpoint returning the entities the prefetcher keeps warm.
+
+    Returns:
+        Flask Response:
+            - 200 OK with the list of watchlist entries.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        return create_response(True, load_watchlist(), None, 200)
+    except Exception as e:
+        logger.error(f"Error loading watchlist: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/watchlist', methods=['POST'])
+@limiter.limit("10 per minute")
+def add_to_watchlist():
+    """
+    POST endpoint to add entities to the watchlist.
+
+    Expects JSON payload with either a single entry or:
+        - entries (list): Entries with name, affiliation and optional entityType.
+
+    Returns:
+        Flask Response:
+            - 200 OK with the updated watchlist.
+            - 400 Bad Request for missing/invalid input.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        if not request.is_json:
+            logger.error("Request does not contain JSON data")
+            return create_response(False, None, "Request must be JSON", 400)
+
+        data = request.json
+        entries = data.get('entries', [data]) if isinstance(data, dict) else data
+        if not isinstance(entries, list) or not entries:
+            return create_response(False, None, "At least one watchlist entry is required", 400)
+
+        return create_response(True, add_entries(entries), None, 200)
+
+    except Exception as e:
+        logger.error(f"Error updating watchlist: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/watchlist', methods=['DELETE'])
+def delete_from_watchlist():
+    """
+    DELETE endpoint to remove an entity from the watchlist.
+
+    Expects JSON payload with:
+        - name (str), affiliation (str) and optional entityType (str).
+
+    Returns:
+        Flask Response:
+            - 200 OK with the updated watchlist.
+            - 400 Bad Request if the payload is not JSON.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        if not request.is_json:
+            logger.error("Request does not contain JSON data")
+            return create_response(False, None, "Request must be JSON", 400)
+
+        return create_response(True, remove_entry(request.json), None, 200)
+
+    except Exception as e:
+        logger.error(f"Error updating watchlist: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/watchlist/stats', methods=['GET'])
+def watchlist_stats():
+    """
+    GET endpoint reporting prefetch coverage and how many prefetched entries were read.
+
+    Returns:
+        Flask Response:
+            - 200 OK with coverage and store statistics.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        return create_response(True, get_prefetch_stats(), None, 200)
+    except Exception as e:
+        logger.error(f"Error computing watchlist stats: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
+
+@api.route('/watchlist/prefetch', methods=['POST'])
+@limiter.limit("2 per hour")
+def trigger_prefetch():
+    """
+    POST endpoint to start a prefetch pass outside the scheduled windows.
+
+    Returns:
+        Flask Response:
+            - 202 Accepted once the pass has been started in the background.
+            - 409 Conflict with the running pass if one is already in progress.
+            - 500 Internal Server Error for unexpected issues.
+    """
+    try:
+        if not start_prefetch():
+            return create_response(False, None, {
+                "message": "A prefetch pass is already running",
+                "running": get_running_pass()
+            }, 409)
+        return create_response(True, {"status": "started"}, None, 202)
+    except Exception as e:
+        logger.error(f"Error starting prefetch: {str(e)}")
+        return create_response(False, None, "An unexpected error occurred", 500)
@@ -0,0 +1,306 @@
+import json
+import threading
+from string import Template
+from typing import Dict, Any, Optional, Literal
+from utils.logger import get_logger
+
+# Logger
+logger = get_logger()
+
+# Operation and entity type definitions
+Operation = Literal["verify", "research"]
+EntityType = Literal["academic", "startup"]
+
+# Tokenizer used by gpt-4o models; loaded off the request path, see load_encoder
+TOKENIZER_ENCODING = "o200k_base"
+
+# Static instructions per operation and entity type. Everything that does not depend on
+# the entity lives here so that the system message is a byte-identical prefix per
+# entity type, which lets the upstream reuse its prompt-prefix cache across requests.
+INSTRUCTIONS = {
+    "verify": {
+        "academic": (
+            "You are a research assistant that identifies academic professionals based on their name and affiliation.\n\n"
+            "Your task is to return structured, accurate, and current information about the academic's identity.\n\n"
+            "Focus on:\n"
+            "- Full name\n"
+            "- Current affiliation\n"
+            "- Current position/title\n"
+            "- A short professional description (including research interests)\n"
+            "- Confidence in the match\n\n"
+            "Guidelines:\n"
+            "- If multiple matches exist, return the most relevant one based on recency and academic profile completeness.\n"
+            "- If no exact match is found, return the closest relevant match with a reduced confidence score.\n"
+            "- If no match is found at all, return an empty object with \"confidence_score\": 0.\n\n"
+            "Confidence Score Guide:\n"
+            "- 100 = Exact match (name + affiliation + title verified)\n"
+            "- 80-99 = High match (1 fuzzy detail, like abbreviated name or outdated title)\n"
+            "- 50-79 = Partial match (multiple fields fuzzy or inferred)\n"
+            "- 0 = No match found"
+        ),
+        "startup": (
+            "You are a research assistant that identifies startup founders and their companies based on provided names or organization details.\n\n"
+            "Your task is to return structured, accurate, and current information about the founder and their startup.\n\n"
+            "Focus on:\n"
+            "- Full name of the founder\n"
+            "- Role in the startup\n"
+            "- Startup name and description (what it does)\n"
+            "- Current funding stage and any notable achievements (e.g., awards, acquisitions, press)\n"
+            "- Confidence in the match\n\n"
+            "Guidelines:\n"
+            "- If multiple matches exist, return the most relevant one based on recency and profile completeness.\n"
+            "- If no exact match is found, return the closest relevant match with a reduced confidence score.\n"
+            "- If no match is found at all, return an empty object with \"confidence_score\": 0.\n\n"
+            "Confidence Score Guide:\n"
+            "- 100 = Exact match (founder + startup + role + stage verified)\n"
+            "- 80-99 = High match (1 fuzzy detail, like outdated role or partial name)\n"
+            "- 50-79 = Partial match (multiple fields fuzzy or inferred)\n"
+            "- 0 = No match found"
+        )
+    },
+    "research": {
+        "academic": (
+            "You are a research assistant tasked with generating structured, detailed research profiles for academic professionals.\n\n"
+            "Your objective is to gather factual, well-sourced, and relevant data that would support academic grant writing and collaboration strategy.\n\n"
+            "Focus Areas:\n"
+            "1. Current and past research focus areas\n"
+            "2. Notable publications and projects\n"
+            "3. Academic or industry collaborations and affiliations\n"
+            "4. Previous grants or research funding\n"
+            "5. Public mentions or recognition (e.g., news, awards)\n"
+            "6. Strategic insights to support grant planning\n\n"
+            "Guidelines:\n"
+            "- Use only verifiable data from credible sources (e.g., university websites, Google Scholar, Scopus, ORCID, funding agency databases).\n"
+            "- Do not guess or fabricate insights. If a section has fewer than 3 items, include only what is known.\n"
+            "- Include exactly the fields defined in the JSON schema. Return an empty array for any category where data could not be verified.\n"
+            "- All data must be specifically linked to the requested person. Do not include general research at their institution unless it is explicitly tied to their work."
+        ),
+        "startup": (
+            "You are a research assistant tasked with generating structured, detailed profiles for startup founders and their companies.\n\n"
+            "Your objective is to gather factual, well-sourced, and relevant data that would support funding strategy and strategic alignment.\n\n"
+            "Focus Areas:\n"
+            "1. Business focus areas and market positioning\n"
+            "2. Products, services, and technological innovations\n"
+            "3. Strategic partnerships and industry collaborations\n"
+            "4. Previous funding rounds, grants, and investors\n"
+            "5. Public mentions or recognition (e.g., press coverage, awards, accelerators)\n"
+            "6. Strategic insights to support investment pitches or partnership outreach\n\n"
+            "Guidelines:\n"
+            "- Use only verifiable data from credible sources (e.g., Crunchbase, company websites, press releases, LinkedIn, funding databases).\n"
+            "- Do not guess or fabricate insights. If a section has fewer than 3 items, include only what is known.\n"
+            "- Include exactly the fields defined in the JSON schema. Return an empty array for any category where data could not be verified.\n"
+            "- All data must be specifically linked to the requested person. Do not include general activity at their company unless it is explicitly tied to their work."
+        )
+    }
+}
+
+# Response schema per operation, shared by both entity types
+SCHEMAS = {
+    "verify": {
+        "full_name": "Complete name of the person or empty string if not found",
+        "affiliation": "Current institution or company, or empty string if not found",
+        "title": "Current position or role, or empty string if not found",
+        "brief_description": "1–2 sentence summary including research area and academic focus",
+        "confidence_score": "A number from 0–100 indicating match confidence"
+    },
+    "research": {
+        "research_focus": ["Focus area"],
+        "projects_publications": ["Project or publication"],
+        "institutional_connections": ["Collaborator or institution"],
+        "funding_history": ["Funding agency, project name, year (if known)"],
+        "public_mentions": ["Mention or recognition"],
+        "strategic_insights": ["Insight derived from verified information to support grants or partnerships"]
+    }
+}
+
+# Output rules appended after the schema
+OUTPUT_RULES = {
+    "verify": "Return only the JSON object. Do not include any additional explanations or commentary.",
+    "research": (
+        "- Include 3–7 items per field if available. Return fewer if needed, but do not generate unverifiable data.\n"
+        "- All information must be accurate, specific, and relevant.\n"
+        "- Return only the JSON object. Do not include any extra explanations."
+    )
+}
+
+# Per-entity user messages, kept as short as possible
+USER_TEMPLATES = {
+    "verify": Template("Find information about $name from $affiliation."),
+    "research": Template("Provide detailed research on $name, $title at $affiliation.")
+}
+
+def _compile_system_prompt(operation: Operation, entity_type: EntityType) -> str:
+    schema = json.dumps(SCHEMAS[operation], ensure_ascii=False, separators=(", ", ": "))
+    return (
+        f"{INSTRUCTIONS[operation][entity_type]}\n\n"
+        f"Return a valid JSON object with EXACTLY the following structure:\n{schema}\n"
+        f"{OUTPUT_RULES[operation]}"
+    )
+
+# System prompts are compiled once at import and never change afterwards
+SYSTEM_PROMPTS = {
+    operation: {entity_type: _compile_system_prompt(operation, entity_type) for entity_type in INSTRUCTIONS[operation]}
+    for operation in INSTRUCTIONS
+}
+
+def get_system_prompt(operation: Operation, entity_type: EntityType) -> str:
+    """
+    Returns the precompiled system prompt (static instructions and schema)
+
+    Args:
+        operation: Either 'verify' or 'research'
+        entity_type: Either 'academic' or 'startup'; unknown values fall back to 'academic'
+
+    Returns:
+        The system prompt as a string, byte-identical for every call with the same arguments
+    """
+    prompts = SYSTEM_PROMPTS[operation]
+    return prompts.get(entity_type, prompts["academic"])
+
+def render_user_prompt(operation: Operation, **values: str) -> str:
+    """
+    Renders the per-entity user prompt
+
+    Args:
+        operation: Either 'verify' or 'research'
+        values: Template variables (name, affiliation and, for research, title)
+
+    Returns:
+        The user prompt as a string
+    """
+    return USER_TEMPLATES[operation].substitute(**values)
+
+# Tokenizer state; None until loaded, False if tiktoken or its encoding is unavailable
+_encoder = None
+_encoder_lock = threading.Lock()
+_encoder_load_started = threading.Lock()
+
+# Exact token counts of the precompiled system prompts, filled in by load_encoder
+_prefix_tokens: Dict[str, int] = {}
+
+def load_encoder() -> bool:
+    """
+    Loads the tiktoken encoding and counts the precompiled system prompts once
+
+    The first load downloads the encoding unless it is in TIKTOKEN_CACHE_DIR, and the
+    download has no timeout, so this must not run on the request path. It is called
+    from app.warm_up() or from a background thread started by count_tokens.
+
+    Returns:
+        True if exact token counts are available
+    """
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            try:
+                import tiktoken
+                encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+                for prompts in SYSTEM_PROMPTS.values():
+                    for prompt in prompts.values():
+                        _prefix_tokens[prompt] = len(encoder.encode(prompt))
+                _encoder = encoder
+            except Exception as e:
+                logger.warning(f"tiktoken unavailable, estimating token counts from length: {e}")
+                _encoder = False
+    return bool(_encoder)
+
+def count_tokens(text: str) -> int:
+    """
+    Counts tokens locally with tiktoken, or estimates roughly 4 characters per token
+
+    Never blocks on loading the encoding: until it is loaded (in the background on
+    first use, or by app.warm_up) the estimate is returned.
+
+    Args:
+        text: The text to count
+
+    Returns:
+        The number of tokens
+    """
+    encoder = _encoder
+    if encoder is None and _encoder_load_started.acquire(blocking=False):
+        threading.Thread(target=load_encoder, name="tiktoken-load", daemon=True).start()
+    if encoder:
+        return len(encoder.encode(text))
+    return (len(text) + 3) // 4
+
+def count_prefix_tokens(system_prompt: str) -> int:
+    """
+    Returns the token count of a system prompt, precomputed for the compiled prompts
+
+    Args:
+        system_prompt: The system prompt as returned by get_system_prompt
+
+    Returns:
+        The number of tokens
+    """
+    cached = _prefix_tokens.get(system_prompt) if _encoder else None
+    return cached if cached is not None else count_tokens(system_prompt)
+
+# Aggregated usage per "operation:entity_type"
+_usage: Dict[str, Dict[str, float]] = {}
+_usage_lock = threading.Lock()
+
+def _usage_field(usage: Any, *path: str) -> int:
+    value = usage
+    for attr in path:
+        value = getattr(value, attr, None)
+        if value is None:
+            return 0
+    return int(value)
+
+def record_usage(operation: Operation, entity_type: EntityType, system_prompt: str, user_prompt: str,
+                 response: Optional[Any], latency_seconds: float) -> Dict[str, Any]:
+    """
+    Records local and upstream token counts for one model call
+
+    Args:
+        operation: Either 'verify' or 'research'
+        entity_type: Either 'academic' or 'startup'
+        system_prompt: The rendered system prompt
+        user_prompt: The rendered user prompt
+        response: The chat completion response, or None if the call failed
+        latency_seconds: Wall time of the call
+
+    Returns:
+        Dict with the counts recorded for this call
+    """
+    usage = getattr(response, "usage", None)
+    prefix_tokens = count_prefix_tokens(system_prompt)
+    call = {
+        "prefix_tokens": prefix_tokens,
+        "local_prompt_tokens": prefix_tokens + count_tokens(user_prompt),
+        "prompt_tokens": _usage_field(usage, "prompt_tokens"),
+        "cached_tokens": _usage_field(usage, "prompt_tokens_details", "cached_tokens"),
+        "completion_tokens": _usage_field(usage, "completion_tokens"),
+        "latency_ms": round(latency_seconds * 1000, 1)
+    }
+    logger.info(f"Prompt usage for {operation}/{entity_type}: {call}")
+
+    key = f"{operation}:{entity_type}"
+    with _usage_lock:
+        totals = _usage.setdefault(key, {"calls": 0})
+        totals["calls"] += 1
+        totals["prefix_tokens"] = call["prefix_tokens"]
+        for field in ["local_prompt_tokens", "prompt_tokens", "cached_tokens", "completion_tokens", "latency_ms"]:
+            totals[field] = totals.get(field, 0) + call[field]
+    return call
+
+def get_usage_stats() -> Dict[str, Any]:
+    """
+    Summarizes recorded prompt usage per operation and entity type
+
+    Returns:
+        Dict keyed by 'operation:entity_type' with totals, averages and the cache hit ratio
+    """
+    with _usage_lock:
+        stats = {}
+        for key, totals in _usage.items():
+            calls = totals["calls"]
+            stats[key] = {
+                **totals,
+                "avg_local_prompt_tokens": round(totals["local_prompt_tokens"] / calls, 1),
+                "avg_latency_ms": round(totals["latency_ms"] / calls, 1),
+                "cached_ratio": round(totals["cached_tokens"] / totals["prompt_tokens"], 4) if totals["prompt_tokens"] else 0.0
+            }
+        return stats
@@ -1,17 +1,35 @@
 import os
 import json
+import time
+import threading
 from datetime import datetime
 from utils.logger import get_logger
+from services import prompt_templates
 from typing import Optional, Literal
-from openai import OpenAI
 
 # Logger
 logger = get_logger()
 
-# OpenAI API Key
-if not os.getenv("OPENAI_API_KEY"):
-    logger.error("OPENAI_API_KEY environment variable is not set")
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# OpenAI client, constructed on first use so importing this module stays cheap
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    Returns the shared OpenAI client, importing and constructing it on first use
+
+    Returns:
+        The OpenAI client instance
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                if not os.getenv("OPENAI_API_KEY"):
+                    logger.error("OPENAI_API_KEY environment variable is not set")
+                _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
 
 # Entity type definition
 EntityType = Literal["academic", "startup"]
@@ -26,85 +44,19 @@ def get_system_prompt(entity_type: EntityType) -> str:
     Returns:
         The system prompt as a string
     """
-    prompts = {
-    "academic": """You are a research assistant tasked with generating structured, detailed research profiles for academic professionals.
-    
-    Your objective is to gather factual, well-sourced, and relevant data that would support academic grant writing and collaboration strategy.
-    
-    Focus Areas:
-    1. Current and past research focus areas
-    2. Notable publications and projects
-    3. Academic or industry collaborations and affiliations
-    4. Previous grants or research funding
-    5. Public mentions or recognition (e.g., news, awards)
-    6. Strategic insights to support grant planning
-    
-    Guidelines:
-    - Use only verifiable data from credible sources (e.g., university websites, Google Scholar, Scopus, ORCID, funding agency databases).
-    - Do not guess or fabricate insights. If a section has fewer than 3 items, include only what is known.
-    - Include exactly the fields defined in the JSON schema. Return an empty array for any category where data could not be verified.
-    """,
-    
-    "startup": """You are a research assistant tasked with generating structured, detailed profiles for startup founders and their companies.
-    
-    Your objective is to gather factual, well-sourced, and relevant data that would support funding strategy and strategic alignment.
-    Focus Areas:
-    1. Business focus areas and market positioning
-    2. Products, services, and technological innovations
-    3. Strategic partnerships and industry collaborations
-    4. Previous funding rounds, grants, and investors
-    5. Public mentions or recognition (e.g., press coverage, awards, accelerators)
-    6. Strategic insights to support investment pitches or partnership outreach
-    Guidelines:
-    - Use only verifiable data from credible sources (e.g., Crunchbase, company websites, press releases, LinkedIn, funding databases).
-    - Do not guess or fabricate insights. If a section has fewer than 3 items, include only what is known.
-    - Include exactly the fields defined in the JSON schema. Return an empty array for any category where data could not be verified.
-    """
-    }
-    return prompts.get(entity_type, prompts["academic"])
+    return prompt_templates.get_system_prompt("research", entity_type)
 
 def get_user_prompt(name, title, affiliation):
-    user_prompt = f"""Provide detailed research on {name}, {title} at {affiliation}.
-
-    All data must be specifically linked to this person. Do not include information about the general research at {affiliation} unless it is explicitly tied to {name}'s work.
-    
-    Return a valid JSON object with EXACTLY the following structure:
-    {{
-        "research_focus": [
-            "Focus area 1",
-            "Focus area 2"
-        ],
-        "projects_publications": [
-            "Project or publication 1",
-            "Project or publication 2"
-        ],
-        "institutional_connections": [
-            "Collaborator or institution 1",
-            "Collaborator or institution 2"
-        ],
-        "funding_history": [
-            "Funding agency, project name, year (if known)"
-        ],
-        "public_mentions": [
-            "Mention or recognition 1"
-        ],
-        "strategic_insights": [
-            "Insight derived from verified information to support grants or partnerships"
-        ]
-    }}
-    - Include 3–7 items per field if available. Return fewer if needed, but do not generate unverifiable data.
-    - All information must be accurate, specific, and relevant.
-    - Return only the JSON object. Do not include any extra explanations.
-    """
-    return user_prompt
+    return prompt_templates.render_user_prompt("research", name=name, title=title, affiliation=affiliation)
 
-def call_openai_api(system_prompt: str, user_prompt: str) -> Optional[str]:
+def call_openai_api(system_prompt: str, user_prompt: str, entity_type: EntityType = "academic") -> Optional[str]:
     """
     Call the OpenAI API with the given prompts.
     
     Args:
         system_prompt: The system prompt for the AI
         user_prompt: The user prompt for the AI
+        entity_type: Either 'academic' or 'startup', used for token accounting
         
     Returns:
         The API response content or None if there was an error
@@ -112,7 +64,8 @@ def call_openai_api(system_prompt: str, user_prompt: str) -> Optional[str]:
     try:
         # logger.info(f"System prompt - Research: {system_prompt}")
         # logger.info(f"User prompt - Research: {user_prompt}")
-        response = client.chat.completions.create(
+        started = time.perf_counter()
+        response = get_client().chat.completions.create(
             model="gpt-4o-search-preview", #gpt-4c
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -128,6 +81,7 @@ def call_openai_api(system_prompt: str, user_prompt: str) -> Optional[str]:
             max_tokens=500
             # tool_choice="required"
         )
+        prompt_templates.record_usage("research", entity_type, system_prompt, user_prompt, response, time.perf_counter() - started)
         return response.choices[0].message.content.strip()
     except Exception as e:
         logger.error(f"OpenAI API call failed: {e}")
@@ -160,7 +114,7 @@ def generate_research(entity_info, entity_type: EntityType):
         user_prompt = get_user_prompt(name, title, affiliation)
 
          # Call OpenAI API
-        api_response = call_openai_api(system_prompt, user_prompt)
+        api_response = call_openai_api(system_prompt, user_prompt, entity_type)
         # logger.info(f"Research API Response: {api_response}")
         content = api_response
         
@@ -189,6 +143,7 @@ def generate_research(entity_info, entity_type: EntityType):
                         result[section] = ["Information not available"]
                 
                 # Add metadata
+                result['research_status'] = "success"
                 result['entity_type'] = entity_type
                 result['generated_at'] = datetime.now().isoformat()
                 
@@ -205,6 +160,7 @@ def generate_research(entity_info, entity_type: EntityType):
         logger.error(f"Research generation error: {e}")
         return {
             "error": str(e),
+            "research_status": "failed",
             "research_focus": ["Error generating research"],
             "projects_publications": ["Error generating research"],
             "institutional_connections": ["Error generating research"],
@@ -218,6 +174,7 @@ def create_fallback_research(entity_type: EntityType):
     logger.info(f"Creating fallback research for entity type: {entity_type}")
     
     fallback = {
+        "research_status": "fallback",
         "entity_type": entity_type,
         "generated_at": datetime.now().isoformat()
     }
@@ -0,0 +1,369 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import closing
+from typing import Dict, Any, Optional, Literal
+from utils.logger import get_logger
+
+# Logger
+logger = get_logger()
+
+# Store configuration
+store_path = os.getenv("RESULT_STORE_PATH", "result_store.db")
+ttl_seconds = int(os.getenv("RESULT_STORE_TTL_HOURS", "24")) * 3600
+
+# Result kind definition
+ResultKind = Literal["verify", "research"]
+
+# Entries and their read counts live in one SQLite database shared by every worker
+# process; each lookup or save is a single transaction, so concurrent writers never
+# overwrite each other's entries. The same database holds leases and small state
+# values that must be shared across workers
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    result_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    affiliation TEXT NOT NULL,
+    source TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    reads INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+def make_result_id(kind: ResultKind, entity_type: str, name: str, affiliation: str, title: str = "") -> str:
+    """
+    Build a stable identifier for a stored result.
+
+    Args:
+        kind: Either 'verify' or 'research'
+        entity_type: Either 'academic' or 'startup'
+        name: The name of the person or entity
+        affiliation: The institution or company affiliation
+        title: The verified title; part of research ids only, since the research prompt uses it
+
+    Returns:
+        A hex digest identifying the result, insensitive to case and surrounding whitespace
+    """
+    fields = [name, affiliation, title] if kind == "research" else [name, affiliation]
+    raw = "|".join([kind, entity_type] + [f.strip().lower() for f in fields])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def content_hash(result: Dict[str, Any]) -> str:
+    """
+    Hash a result payload independently of key order.
+
+    Args:
+        result: The result payload
+
+    Returns:
+        A hex digest that changes only when the payload content changes
+    """
+    canonical = json.dumps(result, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+def is_complete_result(kind: ResultKind, result: Dict[str, Any]) -> bool:
+    """
+    Check whether a result is worth storing.
+
+    Failed verifications, research that fell back to generic placeholder text and
+    results of calls that raised are not stored, so they are retried on the next request.
+
+    Args:
+        kind: Either 'verify' or 'research'
+        result: The result payload
+
+    Returns:
+        True if the result's status is 'success'
+    """
+    status_field = "verification_status" if kind == "verify" else "research_status"
+    return result.get(status_field) == "success"
+
+def _connect() -> sqlite3.Connection:
+    """Open the store database, creating its tables on first use in this process."""
+    global _schema_ready
+    conn = sqlite3.connect(store_path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                _schema_ready = True
+    return conn
+
+def _load_usable(conn: sqlite3.Connection, result_id: str) -> Optional[sqlite3.Row]:
+    """
+    Fetch an entry that is fresh and complete.
+
+    Incomplete results written by earlier versions of the store are skipped.
+    """
+    row = conn.execute("SELECT * FROM results WHERE result_id = ?", (result_id,)).fetchone()
+    if row is None or time.time() - row["stored_at"] >= ttl_seconds:
+        return None
+    if not is_complete_result(row["kind"], json.loads(row["result"])):
+        return None
+    return row
+
+def _count_read(conn: sqlite3.Connection, row: sqlite3.Row) -> None:
+    conn.execute(
+        "UPDATE results SET reads = reads + 1 WHERE result_id = ? AND stored_at = ?",
+        (row["result_id"], row["stored_at"])
+    )
+
+def get_result(kind: ResultKind, entity_type: str, name: str, affiliation: str,
+               title: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Look up a fresh stored result and count the read.
+
+    Args:
+        kind: Either 'verify' or 'research'
+        entity_type: Either 'academic' or 'startup'
+        name: The name of the person or entity
+        affiliation: The institution or company affiliation
+        title: The verified title, used for research results
+
+    Returns:
+        The stored result or None if there is no fresh entry
+    """
+    result_id = make_result_id(kind, entity_type, name, affiliation, title)
+    try:
+        with closing(_connect()) as conn, conn:
+            row = _load_usable(conn, result_id)
+            if row is None:
+                return None
+            _count_read(conn, row)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read result store at {store_path}: {e}")
+        return None
+    logger.info(f"Serving stored {kind} result for {name} from {affiliation}")
+    return json.loads(row["result"])
+
+def peek_result(kind: ResultKind, entity_type: str, name: str, affiliation: str,
+                title: str = "") -> Optional[Dict[str, Any]]:
+    """Look up a fresh stored result without counting a read."""
+    result_id = make_result_id(kind, entity_type, name, affiliation, title)
+    try:
+        with closing(_connect()) as conn:
+            row = _load_usable(conn, result_id)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read result store at {store_path}: {e}")
+        return None
+    return json.loads(row["result"]) if row is not None else None
+
+def get_entry(kind: ResultKind, result_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a fresh stored entry by its result id and count the read.
+
+    Args:
+        kind: Either 'verify' or 'research'
+        result_id: The id returned by save_result or make_result_id
+
+    Returns:
+        Dict with 'result', 'content_hash' and 'stored_at', or None if there is no fresh entry
+    """
+    try:
+        with closing(_connect()) as conn, conn:
+            row = _load_usable(conn, result_id)
+            if row is None or row["kind"] != kind:
+                return None
+            _count_read(conn, row)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read result store at {store_path}: {e}")
+        return None
+    return {
+        "result": json.loads(row["result"]),
+        "content_hash": row["content_hash"],
+        "stored_at": row["stored_at"]
+    }
+
+def save_result(kind: ResultKind, entity_type: str, name: str, affiliation: str,
+                result: Dict[str, Any], source: str = "request", title: str = "") -> str:
+    """
+    Store a result, replacing any previous entry for the same entity.
+
+    A prefetch starts the entry's read count from zero, so prefetched reads only count
+    reads of the prefetched version; other replacements keep the count.
+
+    Args:
+        kind: Either 'verify' or 'research'
+        entity_type: Either 'academic' or 'startup'
+        name: The name of the person or entity
+        affiliation: The institution or company affiliation
+        result: The result payload to store
+        source: Where the result came from, e.g. 'prefetch' or 'request'
+        title: The verified title, used for research results
+
+    Returns:
+        The result id of the stored entry
+    """
+    result_id = make_result_id(kind, entity_type, name, affiliation, title)
+    now = time.time()
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO results (result_id, kind, entity_type, name, affiliation, source, stored_at, content_hash, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(result_id) DO UPDATE SET "
+                "kind = excluded.kind, entity_type = excluded.entity_type, name = excluded.name, "
+                "affiliation = excluded.affiliation, source = excluded.source, stored_at = excluded.stored_at, "
+                "content_hash = excluded.content_hash, result = excluded.result, "
+                "reads = CASE WHEN excluded.source = 'prefetch' THEN 0 ELSE results.reads END",
+                (result_id, kind, entity_type, name, affiliation, source, now,
+                 content_hash(result), json.dumps(result, ensure_ascii=False))
+            )
+            # Drop expired entries in the same transaction
+            conn.execute("DELETE FROM results WHERE stored_at < ?", (now - ttl_seconds,))
+    except sqlite3.Error as e:
+        logger.error(f"Failed to persist result to {store_path}: {e}")
+    return result_id
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Summarize fresh entries in the store.
+
+    Read counts are shared by all processes using the same store.
+
+    Returns:
+        Dict with entry counts and how many prefetched entries have been read
+    """
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT kind, source, reads, result FROM results WHERE stored_at >= ?",
+            (time.time() - ttl_seconds,)
+        ).fetchall()
+    fresh = [r for r in rows if is_complete_result(r["kind"], json.loads(r["result"]))]
+    prefetched = [r for r in fresh if r["source"] == "prefetch"]
+    return {
+        "entries": len(fresh),
+        "prefetched_entries": len(prefetched),
+        "prefetched_entries_read": sum(1 for r in prefetched if r["reads"] > 0),
+        "prefetched_reads": sum(r["reads"] for r in prefetched)
+    }
+
+def acquire_lease(name: str, owner: str, duration: float, details: Dict[str, Any]) -> bool:
+    """
+    Take a named lease shared by every process using the store.
+
+    The lease is granted if nobody holds it, the holder's lease has expired or the
+    caller already holds it. The check and the write are one statement, so at most
+    one process wins.
+
+    Args:
+        name: The lease name
+        owner: A string unique to the caller
+        duration: Seconds until the lease expires unless renewed
+        details: JSON serializable description of the holder's work
+
+    Returns:
+        True if the caller now holds the lease
+    """
+    now = time.time()
+    try:
+        with closing(_connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO leases (name, owner, expires_at, details) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, "
+                "expires_at = excluded.expires_at, details = excluded.details "
+                "WHERE leases.expires_at <= ? OR leases.owner = excluded.owner",
+                (name, owner, now + duration, json.dumps(details), now)
+            )
+            return cursor.rowcount == 1
+    except sqlite3.Error as e:
+        logger.error(f"Failed to acquire lease {name} in {store_path}: {e}")
+        return False
+
+def renew_lease(name: str, owner: str, duration: float, details: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Extend a lease the caller holds.
+
+    Args:
+        name: The lease name
+        owner: The owner string passed to acquire_lease
+        duration: Seconds from now until the lease expires
+        details: Replacement details, or None to keep the current ones
+
+    Returns:
+        True if the caller still held the lease
+    """
+    try:
+        with closing(_connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE leases SET expires_at = ?, details = COALESCE(?, details) "
+                "WHERE name = ? AND owner = ?",
+                (time.time() + duration, json.dumps(details) if details is not None else None, name, owner)
+            )
+            return cursor.rowcount == 1
+    except sqlite3.Error as e:
+        logger.error(f"Failed to renew lease {name} in {store_path}: {e}")
+        return False
+
+def release_lease(name: str, owner: str) -> None:
+    """Give up a lease if the caller still holds it."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+    except sqlite3.Error as e:
+        logger.error(f"Failed to release lease {name} in {store_path}: {e}")
+
+def get_lease(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up an unexpired lease.
+
+    Args:
+        name: The lease name
+
+    Returns:
+        The details stored by the holder, or None if nobody holds the lease
+    """
+    try:
+        with closing(_connect()) as conn:
+            row = conn.execute(
+                "SELECT details FROM leases WHERE name = ? AND expires_at > ?", (name, time.time())
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read lease {name} from {store_path}: {e}")
+        return None
+    return json.loads(row["details"]) if row is not None else None
+
+def get_state(key: str) -> Optional[Any]:
+    """Return a shared state value, or None if it has not been set."""
+    try:
+        with closing(_connect()) as conn:
+            row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to read state {key} from {store_path}: {e}")
+        return None
+    return json.loads(row["value"]) if row is not None else None
+
+def set_state(key: str, value: Any) -> None:
+    """Set a JSON serializable state value shared by every process using the store."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value))
+            )
+    except sqlite3.Error as e:
+        logger.error(f"Failed to write state {key} to {store_path}: {e}")
@@ -1,16 +1,34 @@
 import os
 import json
+import time
+import threading
 from typing import Dict, Any, Optional, Literal
 from utils.logger import get_logger
-from openai import OpenAI
+from services import prompt_templates
 
 # Logger
 logger = get_logger()
 
-# OpenAI API Key
-if not os.getenv("OPENAI_API_KEY"):
-    logger.error("OPENAI_API_KEY environment variable is not set")
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# OpenAI client, constructed on first use so importing this module stays cheap
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    Returns the shared OpenAI client, importing and constructing it on first use
+
+    Returns:
+        The OpenAI client instance
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                if not os.getenv("OPENAI_API_KEY"):
+                    logger.error("OPENAI_API_KEY environment variable is not set")
+                _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
 
 # Entity type definition
 EntityType = Literal["academic", "startup"]
@@ -25,55 +43,29 @@ def get_system_prompt(entity_type: EntityType) -> str:
     Returns:
         The system prompt as a string
     """
-    prompts = {
-        "academic": (
-            "You are a research assistant that identifies academic professionals based on their name and affiliation.\n\n"
-            "Your task is to return structured, accurate, and current information about the academic's identity.\n\n"
-            "Focus on:\n"
-            "- Full name\n"
-            "- Current affiliation\n"
-            "- Current position/title\n"
-            "- A short professional description (including research interests)\n"
-            "- Confidence in the match\n\n"
-            "Guidelines:\n"
-            "- If multiple matches exist, return the most relevant one based on recency and academic profile completeness.\n"
-            "- If no exact match is found, return the closest relevant match with a reduced confidence score.\n"
-            "- If no match is found at all, return an empty object with \"confidence_score\": 0.\n\n"
-            "Confidence Score Guide:\n"
-            "- 100 = Exact match (name + affiliation + title verified)\n"
-            "- 80-99 = High match (1 fuzzy detail, like abbreviated name or outdated title)\n"
-            "- 50-79 = Partial match (multiple fields fuzzy or inferred)\n"
-            "- 0 = No match found"
-        ),
-        "startup": (
-            "You are a research assistant that identifies startup founders and their companies based on provided names or organization details.\n\n"
-            "Your task is to return structured, accurate, and current information about the founder and their startup.\n\n"
-            "Focus on:\n"
-            "- Full name of the founder\n"
-            "- Role in the startup\n"
-            "- Startup name and description (what it does)\n"
-            "- Current funding stage and any notable achievements (e.g., awards, acquisitions, press)\n"
-            "- Confidence in the match\n\n"
-            "Guidelines:\n"
-            "- If multiple matches exist, return the most relevant one based on recency and profile completeness.\n"
-            "- If no exact match is found, return the closest relevant match with a reduced confidence score.\n"
-            "- If no match is found at all, return an empty object with \"confidence_score\": 0.\n\n"
-            "Confidence Score Guide:\n"
-            "- 100 = Exact match (founder + startup + role + stage verified)\n"
-            "- 80-99 = High match (1 fuzzy detail, like outdated role or partial name)\n"
-            "- 50-79 = Partial match (multiple fields fuzzy or inferred)\n"
-            "- 0 = No match found"
-        )
-    }
-    return prompts.get(entity_type, prompts["academic"])
+    return prompt_templates.get_system_prompt("verify", entity_type)
 
-def call_openai_api(system_prompt: str, user_prompt: str) -> Optional[str]:
+def get_user_prompt(name: str, affiliation: str) -> str:
+    """
+    Returns the user prompt for the entity being verified
+
+    Args:
+        name: The name of the person or entity
+        affiliation: The institution or company affiliation
+
+    Returns:
+        The user prompt as a string
+    """
+    return prompt_templates.render_user_prompt("verify", name=name, affiliation=affiliation)
+
+def call_openai_api(system_prompt: str, user_prompt: str, entity_type: EntityType = "academic") -> Optional[str]:
     """
     Call the OpenAI API with the given prompts.
     
     Args:
         system_prompt: The system prompt for the AI
         user_prompt: The user prompt for the AI
+        entity_type: Either 'academic' or 'startup', used for token accounting
         
     Returns:
         The API response content or None if there was an error
@@ -81,7 +73,8 @@ def call_openai_api(system_prompt: str, user_prompt: str) -> Optional[str]:
     try:
         # logger.info(f"System prompt - Verification: {system_prompt}")
         # logger.info(f"User prompt - Verification: {user_prompt}")
-        response = client.chat.completions.create(
+        started = time.perf_counter()
+        response = get_client().chat.completions.create(
             model="gpt-4o-search-preview", #gpt-4c
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -97,6 +90,7 @@ def call_openai_api(system_prompt: str, user_prompt: str) -> Optional[str]:
             max_tokens=500
             # tool_choice="required"
         )
+        prompt_templates.record_usage("verify", entity_type, system_prompt, user_prompt, response, time.perf_counter() - started)
         # logger.info(f"Message: {response.choices[0].message}")
         return response.choices[0].message.content.strip()
     except Exception as e:
@@ -209,22 +203,10 @@ def verify_entity(name: str, affiliation: str, entity_type: EntityType) -> Dict[
         system_prompt = get_system_prompt(entity_type)
 
         # Prompt for the user
-        user_prompt = f"""Find information about {name} from {affiliation}.
-        
-        Return a valid JSON object with EXACTLY the following fields:
-        {{
-            "full_name": "Complete name of the person or empty string if not found",
-            "affiliation": "Current institution or company, or empty string if not found",
-            "title": "Current position or role, or empty string if not found",
-            "brief_description": "1–2 sentence summary including research area and academic focus",
-            "confidence_score": "A number from 0–100 indicating match confidence"
-        }}
-        
-        Return only the JSON object. Do not include any additional explanations or commentary.
-        """
+        user_prompt = get_user_prompt(name, affiliation)
 
         # Call OpenAI API
-        api_response = call_openai_api(system_prompt, user_prompt)
+        api_response = call_openai_api(system_prompt, user_prompt, entity_type)
         logger.info(f"Verify API Response: {api_response}")
 
         # Parse API response
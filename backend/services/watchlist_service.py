@@ -0,0 +1,380 @@
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from utils.logger import get_logger
+from services.verify_service import verify_entity
+from services.research_service import generate_research
+from services.result_store import (
+    peek_result, save_result, get_stats, is_complete_result,
+    acquire_lease, renew_lease, release_lease, get_lease, get_state, set_state
+)
+
+# Logger
+logger = get_logger()
+
+# Watchlist and scheduler configuration
+watchlist_path = os.getenv("WATCHLIST_PATH", "watchlist.json")
+prefetch_windows = os.getenv("PREFETCH_WINDOWS", "01:00-05:00")
+prefetch_concurrency = max(1, int(os.getenv("PREFETCH_CONCURRENCY", "2")))
+prefetch_check_interval = int(os.getenv("PREFETCH_CHECK_INTERVAL", "300"))
+prefetch_lease_seconds = int(os.getenv("PREFETCH_LEASE_SECONDS", "900"))
+
+_lock = threading.Lock()
+_scheduler_thread: Optional[threading.Thread] = None
+
+# A pass holds this lease in the result store, so passes never overlap in any worker
+# process; it is renewed as entries finish and expires if the holder dies
+PASS_LEASE = "watchlist-prefetch"
+LAST_RUN_KEY = "watchlist-prefetch-last-run"
+LAST_WINDOW_KEY = "watchlist-prefetch-last-window"
+
+def normalize_entry(entry: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Validate a watchlist entry and normalize its fields.
+
+    Args:
+        entry: Dict with 'name', 'affiliation' and optional 'entityType'
+
+    Returns:
+        The normalized entry or None if name or affiliation is missing
+    """
+    if not isinstance(entry, dict):
+        return None
+    name = str(entry.get('name', '')).strip()
+    affiliation = str(entry.get('affiliation', '')).strip()
+    entity_type = entry.get('entityType', 'academic')
+    if not name or not affiliation:
+        return None
+    if entity_type not in ["academic", "startup"]:
+        entity_type = "academic"
+    return {"name": name, "affiliation": affiliation, "entityType": entity_type}
+
+def _entry_key(entry: Dict[str, str]) -> Tuple[str, str, str]:
+    return (entry["entityType"], entry["name"].lower(), entry["affiliation"].lower())
+
+def load_watchlist() -> List[Dict[str, str]]:
+    """
+    Load the watchlist from disk.
+
+    Returns:
+        List of normalized watchlist entries, empty if the file does not exist
+    """
+    try:
+        with open(watchlist_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Failed to load watchlist from {watchlist_path}: {e}")
+        return []
+    entries = [normalize_entry(e) for e in raw] if isinstance(raw, list) else []
+    return [e for e in entries if e is not None]
+
+def save_watchlist(entries: List[Dict[str, str]]) -> None:
+    """Write the watchlist to disk atomically."""
+    tmp_path = f"{watchlist_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp_path, watchlist_path)
+
+def add_entries(new_entries: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Add entries to the watchlist, ignoring duplicates and invalid entries.
+
+    Args:
+        new_entries: Entries with 'name', 'affiliation' and optional 'entityType'
+
+    Returns:
+        The updated watchlist
+    """
+    with _lock:
+        entries = load_watchlist()
+        known = {_entry_key(e) for e in entries}
+        for raw in new_entries:
+            entry = normalize_entry(raw)
+            if entry is None or _entry_key(entry) in known:
+                continue
+            entries.append(entry)
+            known.add(_entry_key(entry))
+        save_watchlist(entries)
+        return entries
+
+def remove_entry(entry: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Remove an entry from the watchlist.
+
+    Args:
+        entry: Entry with 'name', 'affiliation' and optional 'entityType'
+
+    Returns:
+        The updated watchlist
+    """
+    with _lock:
+        entries = load_watchlist()
+        target = normalize_entry(entry)
+        if target is not None:
+            entries = [e for e in entries if _entry_key(e) != _entry_key(target)]
+            save_watchlist(entries)
+        return entries
+
+def _stored_research(entry: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Find the stored research for an entry via its stored verification."""
+    verified = peek_result("verify", entry["entityType"], entry["name"], entry["affiliation"])
+    if not verified:
+        return None
+    return peek_result("research", entry["entityType"], verified.get("full_name", ""),
+                       verified.get("affiliation", ""), verified.get("title", ""))
+
+def prefetch_entry(entry: Dict[str, str], force: bool = False) -> bool:
+    """
+    Run verification and research for a watchlist entry and store the results.
+
+    Args:
+        entry: A normalized watchlist entry
+        force: Refetch even if fresh results are already stored, so the new entries
+            outlive the next peak period
+
+    Returns:
+        True if both results are warm in the store afterwards
+    """
+    name, affiliation, entity_type = entry["name"], entry["affiliation"], entry["entityType"]
+    try:
+        verified = None if force else peek_result("verify", entity_type, name, affiliation)
+        if not verified:
+            verified = verify_entity(name=name, affiliation=affiliation, entity_type=entity_type)
+            if not is_complete_result("verify", verified):
+                logger.warning(f"Prefetch verification failed for {name} from {affiliation}")
+                return False
+            save_result("verify", entity_type, name, affiliation, verified, source="prefetch")
+
+        full_name = verified.get("full_name", "")
+        verified_affiliation = verified.get("affiliation", "")
+        title = verified.get("title", "")
+        if not force and peek_result("research", entity_type, full_name, verified_affiliation, title):
+            return True
+
+        research = generate_research(entity_info=verified, entity_type=entity_type)
+        if not is_complete_result("research", research):
+            logger.warning(f"Prefetch research failed for {name} from {affiliation}")
+            return False
+        save_result("research", entity_type, full_name, verified_affiliation, research,
+                    source="prefetch", title=title)
+        return True
+
+    except Exception as e:
+        logger.error(f"Prefetch error for {name} from {affiliation}: {e}")
+        return False
+
+def _acquire_pass(force: bool) -> Optional[str]:
+    """
+    Take the pass lease.
+
+    Returns:
+        The owner string to renew and release the lease with, or None if another pass
+        is running in this or another process
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    details = {"started_at": datetime.now().isoformat(), "forced": force, "owner": owner}
+    if not acquire_lease(PASS_LEASE, owner, prefetch_lease_seconds, details):
+        return None
+    return owner
+
+def _run_pass(force: bool, owner: str) -> Dict[str, Any]:
+    """Prefetch every watchlist entry; the caller must hold the pass lease as owner."""
+    entries = load_watchlist()
+    started = time.time()
+    details = {"started_at": datetime.fromtimestamp(started).isoformat(), "forced": force,
+               "owner": owner, "entries": len(entries)}
+    renew_lease(PASS_LEASE, owner, prefetch_lease_seconds, details)
+    logger.info(f"Prefetching {len(entries)} watchlist entries with concurrency {prefetch_concurrency}")
+
+    def _prefetch_and_renew(entry: Dict[str, str]) -> bool:
+        succeeded = prefetch_entry(entry, force)
+        if not renew_lease(PASS_LEASE, owner, prefetch_lease_seconds):
+            logger.warning("Prefetch lease expired during the pass; another pass may overlap")
+        return succeeded
+
+    with ThreadPoolExecutor(max_workers=prefetch_concurrency) as executor:
+        outcomes = list(executor.map(_prefetch_and_renew, entries))
+
+    summary = {
+        "started_at": details["started_at"],
+        "forced": force,
+        "duration_seconds": round(time.time() - started, 2),
+        "entries": len(entries),
+        "succeeded": sum(outcomes),
+        "failed": len(outcomes) - sum(outcomes)
+    }
+    set_state(LAST_RUN_KEY, summary)
+    logger.info(f"Prefetch finished: {summary}")
+    return summary
+
+def run_prefetch(force: bool = False, window: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Prefetch every watchlist entry, with at most PREFETCH_CONCURRENCY entries in flight.
+
+    Args:
+        force: Refetch entries whose stored results are still fresh
+        window: Start of the off-peak window this pass belongs to; the pass is skipped if
+            any worker already ran one for it
+
+    Returns:
+        Dict summarizing the run, or None if another pass was running or the window
+        was already covered
+    """
+    owner = _acquire_pass(force)
+    if owner is None:
+        logger.info("Prefetch pass already running, skipping")
+        return None
+    try:
+        # Checked while holding the lease, so only one worker claims each window
+        if window is not None:
+            if get_state(LAST_WINDOW_KEY) == window:
+                logger.info(f"Prefetch window {window} already covered, skipping")
+                return None
+            set_state(LAST_WINDOW_KEY, window)
+        return _run_pass(force, owner)
+    finally:
+        release_lease(PASS_LEASE, owner)
+
+def start_prefetch(force: bool = False) -> bool:
+    """
+    Start a prefetch pass in a background thread unless one is already running.
+
+    Args:
+        force: Refetch entries whose stored results are still fresh
+
+    Returns:
+        True if a new pass was started
+    """
+    owner = _acquire_pass(force)
+    if owner is None:
+        return False
+
+    def _run() -> None:
+        try:
+            _run_pass(force, owner)
+        except Exception as e:
+            logger.error(f"Manual prefetch failed: {e}")
+        finally:
+            release_lease(PASS_LEASE, owner)
+
+    threading.Thread(target=_run, name="watchlist-prefetch-manual", daemon=True).start()
+    return True
+
+def get_running_pass() -> Optional[Dict[str, Any]]:
+    """Return details of the pass in progress in any worker, or None if no pass is running."""
+    return get_lease(PASS_LEASE)
+
+def get_prefetch_stats() -> Dict[str, Any]:
+    """
+    Report watchlist coverage and how many prefetched entries were read.
+
+    Returns:
+        Dict with coverage, store statistics and the last run summary
+    """
+    entries = load_watchlist()
+    warm = sum(1 for e in entries if _stored_research(e) is not None)
+    return {
+        "watchlist_size": len(entries),
+        "warm_entries": warm,
+        "coverage": round(warm / len(entries), 4) if entries else 0.0,
+        "store": get_stats(),
+        "running": get_running_pass(),
+        "last_run": get_state(LAST_RUN_KEY),
+        "windows": prefetch_windows
+    }
+
+def parse_windows(spec: str) -> List[Tuple[int, int]]:
+    """
+    Parse off-peak windows such as '01:00-05:00,22:30-23:30'.
+
+    Args:
+        spec: Comma separated HH:MM-HH:MM ranges; a range may wrap past midnight
+
+    Returns:
+        List of (start, end) pairs in minutes since midnight; invalid or empty ranges
+        are logged and skipped
+    """
+    windows = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            start, end = part.split("-")
+            window = (_parse_time_of_day(start), _parse_time_of_day(end))
+        except ValueError:
+            logger.warning(f"Ignoring invalid prefetch window: {part}")
+            continue
+        if window[0] == window[1]:
+            logger.warning(f"Ignoring empty prefetch window: {part}")
+            continue
+        windows.append(window)
+    return windows
+
+def _parse_time_of_day(value: str) -> int:
+    """Parse HH:MM into minutes since midnight, raising ValueError when out of range."""
+    hours, minutes = (int(x) for x in value.strip().split(":"))
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"time of day out of range: {value}")
+    return hours * 60 + minutes
+
+def current_window_start(now: datetime, windows: List[Tuple[int, int]]) -> Optional[datetime]:
+    """
+    Find the start of the off-peak window containing `now`.
+
+    Args:
+        now: The local time to check
+        windows: Windows as returned by parse_windows
+
+    Returns:
+        The datetime the active window opened, or None outside every window
+    """
+    minute = now.hour * 60 + now.minute
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for start, end in windows:
+        if start <= end:
+            if start <= minute < end:
+                return midnight + timedelta(minutes=start)
+        elif minute >= start:
+            return midnight + timedelta(minutes=start)
+        elif minute < end:
+            return midnight - timedelta(days=1) + timedelta(minutes=start)
+    return None
+
+def _scheduler_loop() -> None:
+    """
+    Run one prefetch pass per off-peak window occurrence.
+
+    Scheduled passes refetch every entry. Results stored a day earlier, or by a user
+    request in the afternoon, are still fresh at the start of the window but would
+    expire during the following peak period. Every worker may run the scheduler; the
+    pass lease and the shared last window make one of them run each pass.
+    """
+    windows = parse_windows(prefetch_windows)
+    last_window = None
+    while True:
+        window_start = current_window_start(datetime.now(), windows)
+        if window_start is not None and window_start != last_window:
+            last_window = window_start
+            try:
+                run_prefetch(force=True, window=window_start.isoformat())
+            except Exception as e:
+                logger.error(f"Scheduled prefetch failed: {e}")
+        time.sleep(prefetch_check_interval)
+
+def start_scheduler() -> None:
+    """Start the background prefetch scheduler once per process."""
+    global _scheduler_thread
+    if _scheduler_thread is not None:
+        return
+    logger.info(f"Starting watchlist prefetch scheduler for windows {prefetch_windows}")
+    _scheduler_thread = threading.Thread(target=_scheduler_loop, name="watchlist-prefetch", daemon=True)
+    _scheduler_thread.start()
@@ -0,0 +1,155 @@
+import os
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from flask import request, Response
+
+# Compression configuration
+compress_min_size = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+compress_level = int(os.getenv("COMPRESS_LEVEL", "6"))
+encoded_cache_size = int(os.getenv("ENCODED_BODY_CACHE_SIZE", "256"))
+
+# Mimetypes worth compressing
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html"}
+
+# Brotli is optional; None until first use, False if the package is not installed
+_brotli = None
+
+# Serialized and encoded bodies keyed by (cache key, encoding), least recently used evicted first
+_encoded_bodies: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_encoded_lock = threading.Lock()
+
+def _get_brotli():
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli
+
+def negotiate_encoding() -> Optional[str]:
+    """
+    Picks the response encoding from the request's Accept-Encoding header.
+
+    Returns:
+        'br' or 'gzip', preferring brotli when it is installed and accepted at least as
+        strongly as gzip, or None if the client accepts neither
+    """
+    accepted = request.accept_encodings
+    br_quality = accepted.quality("br") if _get_brotli() else 0
+    gzip_quality = accepted.quality("gzip")
+    if br_quality > 0 and br_quality >= gzip_quality:
+        return "br"
+    if gzip_quality > 0:
+        return "gzip"
+    return None
+
+def encode_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compresses a response body.
+
+    Args:
+        body: The uncompressed body
+        encoding: Either 'br' or 'gzip'
+
+    Returns:
+        The compressed body
+    """
+    if encoding == "br":
+        return _get_brotli().compress(body, quality=5)
+    return gzip.compress(body, compresslevel=compress_level)
+
+def _cached(key: Tuple[str, str], build: Callable[[], bytes]) -> bytes:
+    """Returns the cached bytes for key, building and caching them on a miss."""
+    with _encoded_lock:
+        cached = _encoded_bodies.get(key)
+        if cached is not None:
+            _encoded_bodies.move_to_end(key)
+            return cached
+
+    built = build()
+    with _encoded_lock:
+        _encoded_bodies[key] = built
+        while len(_encoded_bodies) > encoded_cache_size:
+            _encoded_bodies.popitem(last=False)
+    return built
+
+def encode_for_request(body: bytes) -> Tuple[bytes, Optional[str]]:
+    """
+    Compresses a body for the current request if it is large enough and the client accepts it.
+
+    Args:
+        body: The uncompressed body
+
+    Returns:
+        tuple: The (possibly compressed) body and the encoding used, or None if uncompressed
+    """
+    if len(body) < compress_min_size:
+        return body, None
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return body, None
+    return encode_body(body, encoding), encoding
+
+def cached_body_for_request(cache_key: str, serialize: Callable[[], bytes]) -> Tuple[bytes, Optional[str]]:
+    """
+    Returns a byte-stable body for the current request, serializing and compressing it at most once.
+
+    Both the serialized (identity) body and each compressed variant are kept in an LRU
+    keyed by cache_key, so repeat requests skip serialization and compression.
+
+    Args:
+        cache_key: Key identifying the body; it must change whenever the body changes
+        serialize: Builds the uncompressed body on a cache miss
+
+    Returns:
+        tuple: The (possibly compressed) body and the encoding used, or None if uncompressed
+    """
+    body = _cached((cache_key, "identity"), serialize)
+    if len(body) < compress_min_size:
+        return body, None
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return body, None
+    return _cached((cache_key, encoding), lambda: encode_body(body, encoding)), encoding
+
+def is_not_modified(etag: str) -> bool:
+    """
+    Checks whether the client already holds the representation with this ETag.
+
+    Args:
+        etag: The unquoted ETag value
+
+    Returns:
+        bool: True if If-None-Match matches (weak comparison)
+    """
+    return request.if_none_match.contains_weak(etag)
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook compressing eligible responses negotiated on Accept-Encoding.
+
+    Skips responses that are streamed, already encoded, not successful, not a
+    compressible mimetype, or smaller than COMPRESS_MIN_SIZE.
+
+    Args:
+        response: The outgoing Flask response
+
+    Returns:
+        The response, compressed in place when eligible
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers):
+        return response
+
+    body, encoding = encode_for_request(response.get_data())
+    if encoding is not None:
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+    return response
@@ -15,7 +15,7 @@ def get_logger() -> logging.Logger:
 
     Logging Setup:
         - Adds a stream handler for console output.
-        - Adds a file handler to write logs to a file named after the app.
+        - Adds a file handler to write logs to a file named after the app; the file is opened on the first record.
         - Ensures handlers are not duplicated if logger is reused.
 
     Returns:
@@ -33,7 +33,7 @@ def get_logger() -> logging.Logger:
         logger.addHandler(console_handler)
 
         # File Handler
-        file_handler = logging.FileHandler(f'{app_name.lower()}.log', encoding='utf-8')
+        file_handler = logging.FileHandler(f'{app_name.lower()}.log', encoding='utf-8', delay=True)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 